@@ -1,36 +1,56 @@
 import os
+import threading
 from uuid import uuid4
-from flask import Flask, render_template, request, jsonify, session, redirect, url_for
+from flask import Flask, Blueprint, current_app, render_template, request, jsonify, session, redirect, url_for
+from werkzeug.local import LocalProxy
 from werkzeug.utils import secure_filename
 from werkzeug.security import generate_password_hash, check_password_hash
-from supabase import create_client
 from datetime import timedelta
-from dotenv import load_dotenv
 import random
 
+from bootstrap import load_config, check_config, create_supabase_client
+from assets import init_assets
+
+bp = Blueprint("main", __name__)
+
 # -----------------------------
-# Configuration (read from env)
+# App factory
 # -----------------------------
 
-load_dotenv()
-SUPABASE_URL = os.environ.get("SUPABASE_URL")
-SUPABASE_KEY = os.environ.get("SUPABASE_KEY")
-SECRET_KEY = os.environ.get("SECRET_KEY", "change-this-secret-in-prod")
+def create_app(config=None):
+    """Build the Flask app. The Supabase client is created lazily per worker."""
+    app = Flask(__name__)
+    app.config.update(load_config())
+    if config:
+        app.config.update(config)
+    check_config(app.config)
+
+    app.secret_key = app.config["SECRET_KEY"]
+    app.permanent_session_lifetime = timedelta(days=7)
 
-if not SUPABASE_URL or not SUPABASE_KEY:
-    raise EnvironmentError("SUPABASE_URL and SUPABASE_KEY must be set as environment variables")
+    app.extensions["supabase"] = {"client": None, "pid": None, "lock": threading.Lock()}
+    app.register_blueprint(bp)
+    init_assets(app)
+    return app
 
-# Initialize Supabase client
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
 
-# Flask app
-app = Flask(__name__)
-app.secret_key = SECRET_KEY
-app.permanent_session_lifetime = timedelta(days=7)
+def get_supabase():
+    """Return this process's Supabase client, connecting on first use.
 
-# Bucket names
-COMPLAINT_BUCKET = os.environ.get("COMPLAINT_BUCKET", "complaint-images")
-WORK_BUCKET = os.environ.get("WORK_BUCKET", "work-images")
+    The client is keyed on the pid so a client created in a gunicorn
+    --preload master is never shared with forked workers.
+    """
+    state = current_app.extensions["supabase"]
+    pid = os.getpid()
+    if state["pid"] != pid:
+        with state["lock"]:
+            if state["pid"] != pid:
+                state["client"] = create_supabase_client(current_app.config)
+                state["pid"] = pid
+    return state["client"]
+
+
+supabase = LocalProxy(get_supabase)
 
 # -----------------------------
 # Helper functions
@@ -41,7 +61,7 @@ def upload_file_to_supabase(bucket_name: str, dest_path: str, file_bytes: bytes,
     try:
         res = supabase.storage.from_(bucket_name).upload(dest_path, file_bytes)
     except Exception as e:
-        app.logger.exception("Supabase upload failed")
+        current_app.logger.exception("Supabase upload failed")
         raise
 
     # Try to get a public url
@@ -51,7 +71,7 @@ def upload_file_to_supabase(bucket_name: str, dest_path: str, file_bytes: bytes,
             return public.get("publicURL") or public.get("public_url") or public.get("publicUrl")
         return public
     except Exception:
-        app.logger.warning("get_public_url failed; trying signed URL")
+        current_app.logger.warning("get_public_url failed; trying signed URL")
 
     # Fallback: create a signed URL
     try:
@@ -60,7 +80,7 @@ def upload_file_to_supabase(bucket_name: str, dest_path: str, file_bytes: bytes,
             return signed.get("signedURL") or signed.get("signed_url") or signed.get("signedUrl")
         return signed
     except Exception:
-        app.logger.exception("Failed to create signed URL")
+        current_app.logger.exception("Failed to create signed URL")
         return dest_path
 
 
@@ -84,36 +104,36 @@ def ensure_staff_logged_in():
 # Routes: Pages
 # -----------------------------
 
-@app.route("/")
+@bp.route("/")
 def index():
     return render_template("login.html")
 
 
-@app.route("/user")
+@bp.route("/user")
 def user_dashboard():
     if not ensure_user_logged_in():
-        return redirect(url_for("index"))
+        return redirect(url_for(".index"))
     return render_template("user.html")
 
 
-@app.route("/admin")
+@bp.route("/admin")
 def admin_dashboard():
     if not ensure_admin_logged_in():
-        return redirect(url_for("index"))
+        return redirect(url_for(".index"))
     return render_template("admin.html")
 
 
-@app.route("/verifier")
+@bp.route("/verifier")
 def verifier_dashboard():
     if not ensure_verifier_logged_in():
-        return redirect(url_for("index"))
+        return redirect(url_for(".index"))
     return render_template("verifier.html")
 
 
-@app.route("/staff")
+@bp.route("/staff")
 def staff_dashboard():
     if not ensure_staff_logged_in():
-        return redirect(url_for("index"))
+        return redirect(url_for(".index"))
     return render_template("staff.html")
 
 
@@ -121,7 +141,7 @@ def staff_dashboard():
 # API: Register / Login / Logout
 # -----------------------------
 
-@app.route("/register", methods=["GET", "POST"])
+@bp.route("/register", methods=["GET", "POST"])
 def register():
     if request.method == "GET":
         return render_template("register.html")
@@ -154,7 +174,7 @@ def register():
                 return jsonify({"success": False, "message": msg}), 409
             return render_template("register.html", error=msg), 409
     except Exception:
-        app.logger.exception("Failed checking existing user")
+        current_app.logger.exception("Failed checking existing user")
 
     pw_hash = generate_password_hash(password)
 
@@ -173,16 +193,16 @@ def register():
         data_out = getattr(res, "data", None) or (res.get("data") if isinstance(res, dict) else None)
         if request.is_json or ("application/json" in (request.headers.get("Accept") or "")):
             return jsonify({"success": True, "message": "Registration successful", "data": data_out}), 201
-        return redirect(url_for("index"))
+        return redirect(url_for(".index"))
     except Exception as e:
-        app.logger.exception("Registration failed")
+        current_app.logger.exception("Registration failed")
         err_msg = str(e)
         if request.is_json or ("application/json" in (request.headers.get("Accept") or "")):
             return jsonify({"success": False, "message": err_msg}), 500
         return render_template("register.html", error=err_msg), 500
 
 
-@app.route("/login", methods=["POST"])
+@bp.route("/login", methods=["POST"])
 def login():
     """Login endpoint supporting multiple roles"""
     data = request.get_json() or {}
@@ -211,7 +231,7 @@ def login():
             else:
                 return jsonify({"success": False, "message": "Admin not found"}), 404
         except Exception:
-            app.logger.exception("Admin lookup failed")
+            current_app.logger.exception("Admin lookup failed")
             return jsonify({"success": False, "message": "Internal error"}), 500
     
     else:
@@ -239,24 +259,24 @@ def login():
             else:
                 return jsonify({"success": False, "message": "User not found"}), 404
         except Exception:
-            app.logger.exception("User lookup failed")
+            current_app.logger.exception("User lookup failed")
             return jsonify({"success": False, "message": "Internal error"}), 500
 
 
-@app.route("/logout", methods=["GET"])   
+@bp.route("/logout", methods=["GET"])   
 def logout():
     """Clear the session and redirect to login page"""
     session.clear()
     if request.headers.get("Accept") == "application/json":
         return jsonify({"success": True})
-    return redirect(url_for("index"))
+    return redirect(url_for(".index"))
 
 
 # -----------------------------
 # API: Complaint create / read / update
 # -----------------------------
 
-@app.route("/submit_complaint", methods=["POST"])
+@bp.route("/submit_complaint", methods=["POST"])
 def submit_complaint():
     """Submit a new complaint with images"""
     if not ensure_user_logged_in():
@@ -279,10 +299,10 @@ def submit_complaint():
             dest_path = f"{user_id}/{uuid4().hex}_{fname}"
             try:
                 file_bytes = f.read()
-                pub_url = upload_file_to_supabase(COMPLAINT_BUCKET, dest_path, file_bytes, f.content_type)
+                pub_url = upload_file_to_supabase(current_app.config["COMPLAINT_BUCKET"], dest_path, file_bytes, f.content_type)
                 public_urls.append(pub_url)
             except Exception as e:
-                app.logger.exception("Failed uploading complaint image")
+                current_app.logger.exception("Failed uploading complaint image")
                 upload_errors.append(str(e))
 
     if upload_errors:
@@ -306,11 +326,11 @@ def submit_complaint():
             return jsonify({"success": True, "data": data_out}), 201
         return jsonify({"success": True, "message": "Complaint submitted"}), 201
     except Exception:
-        app.logger.exception("Failed to create complaint")
+        current_app.logger.exception("Failed to create complaint")
         return jsonify({"success": False, "message": "Internal error"}), 500
 
 
-@app.route("/get_complaints", methods=["GET"])
+@bp.route("/get_complaints", methods=["GET"])
 def get_complaints():
     if not ("user_id" in session):
         return jsonify({"success": False, "message": "Not authenticated"}), 401
@@ -326,7 +346,7 @@ def get_complaints():
             data_out = getattr(res, "data", None) or (res.get("data") if isinstance(res, dict) else None)
             return jsonify({"success": True, "data": data_out})
         except Exception:
-            app.logger.exception("Failed to list complaints for admin")
+            current_app.logger.exception("Failed to list complaints for admin")
             return jsonify({"success": False, "message": "Internal error"}), 500
     else:
         try:
@@ -334,10 +354,53 @@ def get_complaints():
             data_out = getattr(res, "data", [])
             return jsonify({"success": True, "data": data_out})
         except Exception as e:
-            app.logger.exception("Failed to list user's complaints: " + str(e))
+            current_app.logger.exception("Failed to list user's complaints: " + str(e))
             return jsonify({"success": False, "message": "Internal error"}), 500
 
-@app.route("/admin/create_user", methods=["POST"])
+
+# -----------------------------
+# API: Archived (cold) complaints, see archive_job.py
+# -----------------------------
+
+ARCHIVE_PAGE_SIZE = 50
+ARCHIVE_MAX_PAGE_SIZE = 200
+
+
+@bp.route("/archived_complaints", methods=["GET"])
+def archived_complaints():
+    """One page of archived complaints, newest first (offset / limit query args)."""
+    if not ("user_id" in session):
+        return jsonify({"success": False, "message": "Not authenticated"}), 401
+    try:
+        limit = int(request.args.get("limit", ARCHIVE_PAGE_SIZE))
+        offset = int(request.args.get("offset", 0))
+    except ValueError:
+        return jsonify({"success": False, "message": "Invalid limit or offset"}), 400
+    limit = max(1, min(limit, ARCHIVE_MAX_PAGE_SIZE))
+    offset = max(0, offset)
+
+    select_query = """
+                *,
+                creator:user_id(id, first_name, last_name, email, phone_number),
+                assignee:assigned_to(id, first_name, last_name)
+            """
+    try:
+        q = supabase.table("complaints_archive").select(select_query)
+        if session.get("user_type") != "admin":
+            q = q.eq("user_id", session.get("user_id"))
+        # Ask for one extra row to know whether another page exists
+        res = q.order("created_at", desc=True).range(offset, offset + limit).execute()
+        data_out = getattr(res, "data", None) or (res.get("data") if isinstance(res, dict) else None) or []
+        return jsonify({
+            "success": True,
+            "data": [dict(c, archived=True) for c in data_out[:limit]],
+            "next_offset": offset + limit if len(data_out) > limit else None
+        })
+    except Exception:
+        current_app.logger.exception("Failed to list archived complaints")
+        return jsonify({"success": False, "message": "Internal error"}), 500
+
+@bp.route("/admin/create_user", methods=["POST"])
 def admin_create_user():
     if not ensure_admin_logged_in():
         return jsonify({"success": False, "message": "Not authorized"}), 403
@@ -379,11 +442,11 @@ def admin_create_user():
         supabase.table("users").insert(payload).execute()
         return jsonify({"success": True, "message": f"{role.capitalize()} created successfully."})
     except Exception as e:
-        app.logger.exception("Admin failed to create user")
+        current_app.logger.exception("Admin failed to create user")
         return jsonify({"success": False, "message": str(e)}), 500
 
 
-@app.route("/api/get_staff")
+@bp.route("/api/get_staff")
 def get_staff():
     if not ensure_admin_logged_in():
         return jsonify({"success": False, "message": "Not authorized"}), 403
@@ -393,10 +456,10 @@ def get_staff():
         staff_list = getattr(res, "data", [])
         return jsonify({"success": True, "data": staff_list})
     except Exception as e:
-        app.logger.exception("Failed to get staff list")
+        current_app.logger.exception("Failed to get staff list")
         return jsonify({"success": False, "message": str(e)}), 500
 
-@app.route("/verifier_complaints", methods=["GET"])  
+@bp.route("/verifier_complaints", methods=["GET"])  
 def verifier_complaints():
     if not ensure_verifier_logged_in():
         return jsonify({"success": False, "message": "Not authenticated"}), 401
@@ -406,11 +469,11 @@ def verifier_complaints():
         data_out = getattr(res, "data", [])
         return jsonify({"success": True, "data": data_out})
     except Exception as e:
-        app.logger.exception("Failed to list verifier complaints: " + str(e))
+        current_app.logger.exception("Failed to list verifier complaints: " + str(e))
         return jsonify({"success": False, "message": "Internal error"}), 500
 
 
-@app.route("/staff_complaints", methods=["GET"])  
+@bp.route("/staff_complaints", methods=["GET"])  
 def staff_complaints():
     if not ensure_staff_logged_in():
         return jsonify({"success": False, "message": "Not authenticated"}), 401
@@ -419,11 +482,11 @@ def staff_complaints():
         data_out = getattr(res, "data", None) or (res.get("data") if isinstance(res, dict) else None)
         return jsonify({"success": True, "data": data_out})
     except Exception:
-        app.logger.exception("Failed to list staff complaints")
+        current_app.logger.exception("Failed to list staff complaints")
         return jsonify({"success": False, "message": "Internal error"}), 500
 
 
-@app.route("/verify_complaint", methods=["POST"])  
+@bp.route("/verify_complaint", methods=["POST"])  
 def verify_complaint():
     if not ensure_verifier_logged_in():
         return jsonify({"success": False, "message": "Not authorized"}), 403
@@ -458,7 +521,7 @@ def verify_complaint():
         
         return jsonify({"success": True})
     except Exception as e:
-        app.logger.exception("Failed to verify complaint: " + str(e))
+        current_app.logger.exception("Failed to verify complaint: " + str(e))
         return jsonify({"success": False, "message": "Internal error"}), 500
 
 def create_notification(user_id, complaint_id, message):
@@ -469,9 +532,9 @@ def create_notification(user_id, complaint_id, message):
             "payload": {"complaint_id": complaint_id, "message": message}
         }).execute()
     except Exception as e:
-        app.logger.error(f"Failed to create notification: {e}")
+        current_app.logger.error(f"Failed to create notification: {e}")
 
-@app.route("/staff_update", methods=["POST"])  
+@bp.route("/staff_update", methods=["POST"])  
 def staff_update():
     if not ensure_staff_logged_in():
         return jsonify({"success": False, "message": "Not authorized"}), 403
@@ -485,10 +548,10 @@ def staff_update():
             dest_path = f"staff_{session.get('user_id')}/{uuid4().hex}_{fname}"
             try:
                 file_bytes = f.read()
-                pub_url = upload_file_to_supabase(WORK_BUCKET, dest_path, file_bytes, f.content_type)
+                pub_url = upload_file_to_supabase(current_app.config["WORK_BUCKET"], dest_path, file_bytes, f.content_type)
                 public_urls.append(pub_url)
             except Exception:
-                app.logger.exception("Failed uploading work image")
+                current_app.logger.exception("Failed uploading work image")
     try:
         update_payload = {}
         complaint_q = supabase.table("complaints").select("user_id, title").eq("id", complaint_id).limit(1).execute()
@@ -515,11 +578,11 @@ def staff_update():
         }).execute()
         return jsonify({"success": True})
     except Exception:
-        app.logger.exception("Failed to update by staff")
+        current_app.logger.exception("Failed to update by staff")
         return jsonify({"success": False, "message": "Internal error"}), 500
 
 
-@app.route("/update_complaint", methods=["POST"])  
+@bp.route("/update_complaint", methods=["POST"])  
 def update_complaint():
     """Admin-only endpoint to update complaint"""
     if not ensure_admin_logged_in():
@@ -537,10 +600,10 @@ def update_complaint():
             dest_path = f"admin_{session.get('user_id')}/{uuid4().hex}_{fname}"
             try:
                 file_bytes = f.read()
-                pub_url = upload_file_to_supabase(WORK_BUCKET, dest_path, file_bytes, f.content_type)
+                pub_url = upload_file_to_supabase(current_app.config["WORK_BUCKET"], dest_path, file_bytes, f.content_type)
                 public_urls.append(pub_url)
             except Exception:
-                app.logger.exception("Failed uploading work image")
+                current_app.logger.exception("Failed uploading work image")
 
     update_payload = {"updated_at": "now()"}
     if status:
@@ -563,7 +626,7 @@ def update_complaint():
             update_payload["work_images"] = new_images
             
         except Exception:
-            app.logger.exception("Failed to fetch existing work_images")
+            current_app.logger.exception("Failed to fetch existing work_images")
             update_payload["work_images"] = public_urls
 
     try:
@@ -580,11 +643,11 @@ def update_complaint():
         
         return jsonify({"success": True, "data": data_out})
     except Exception:
-        app.logger.exception("Failed to update complaint")
+        current_app.logger.exception("Failed to update complaint")
         return jsonify({"success": False, "message": "Internal error"}), 500
 
 
-@app.route("/feedback", methods=["POST"])  
+@bp.route("/feedback", methods=["POST"])  
 def submit_feedback():
     if not ("user_id" in session):
         return jsonify({"success": False, "message": "Not authenticated"}), 401
@@ -598,11 +661,11 @@ def submit_feedback():
         }).execute()
         return jsonify({"success": True})
     except Exception:
-        app.logger.exception("Failed to submit feedback")
+        current_app.logger.exception("Failed to submit feedback")
         return jsonify({"success": False, "message": "Internal error"}), 500
 
 
-@app.route("/notifications", methods=["GET"])  
+@bp.route("/notifications", methods=["GET"])  
 def list_notifications():
     if not ("user_id" in session):
         return jsonify({"success": False, "message": "Not authenticated"}), 401
@@ -611,7 +674,7 @@ def list_notifications():
         data_out = getattr(res, "data", None) or (res.get("data") if isinstance(res, dict) else None)
         return jsonify({"success": True, "data": data_out})
     except Exception:
-        app.logger.exception("Failed to list notifications")
+        current_app.logger.exception("Failed to list notifications")
         return jsonify({"success": False, "message": "Internal error"}), 500
 
 
@@ -626,7 +689,7 @@ def create_admin(email: str, password: str, name: str = None):
         res = supabase.table("admins").insert(payload).execute()
         return getattr(res, "data", None) or (res.get("data") if isinstance(res, dict) else None)
     except Exception:
-        app.logger.exception("Failed to create admin")
+        current_app.logger.exception("Failed to create admin")
         return None
 
 #-----------------------------
@@ -649,4 +712,4 @@ def generate_unique_short_id():
 # Run
 # -----------------------------
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=int(os.environ.get("PORT", 5000)), debug=True)
\ No newline at end of file
+    create_app().run(host="0.0.0.0", port=int(os.environ.get("PORT", 5000)), debug=True)
\ No newline at end of file
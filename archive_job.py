@@ -0,0 +1,61 @@
+# archive_job.py
+# Scheduled data tiering, e.g. nightly from cron: python archive_job.py
+import os
+import sys
+from bootstrap import load_config, create_supabase_client
+
+
+def int_setting(name, default):
+    """Positive integer from the environment; only this job reads these settings."""
+    raw = os.environ.get(name)
+    if raw is None or raw == "":
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        raise SystemExit(f"{name} must be a whole number, got {raw!r}")
+    if value <= 0:
+        raise SystemExit(f"{name} must be greater than 0, got {value}")
+    return value
+
+
+def run_in_batches(supabase, fn_name, older_than_days, batch_size):
+    """Call a batch SQL function (see schema.sql) until it has nothing left to do."""
+    total = 0
+    while True:
+        res = supabase.rpc(fn_name, {"older_than_days": older_than_days, "batch_size": batch_size}).execute()
+        count = getattr(res, "data", None) or (res.get("data") if isinstance(res, dict) else None)
+        count = int(count or 0)
+        total += count
+        if count < batch_size:
+            return total
+
+
+def main():
+    config = load_config()
+    archive_after_days = int_setting("ARCHIVE_AFTER_DAYS", 365)
+    batch_size = int_setting("ARCHIVE_BATCH_SIZE", 500)
+    retention_days = int_setting("NOTIFICATION_RETENTION_DAYS", 90)
+    supabase = create_supabase_client(config)
+
+    # Each step runs even if the other fails; the exit code reports any failure
+    failed = False
+    try:
+        archived = run_in_batches(supabase, "archive_closed_complaints", archive_after_days, batch_size)
+        print(f"Archived {archived} closed complaint(s) older than {archive_after_days} days")
+    except Exception as e:
+        print("Archiving closed complaints failed:", e, file=sys.stderr)
+        failed = True
+
+    try:
+        purged = run_in_batches(supabase, "purge_read_notifications", retention_days, batch_size)
+        print(f"Purged {purged} read notification(s) older than {retention_days} days")
+    except Exception as e:
+        print("Purging read notifications failed:", e, file=sys.stderr)
+        failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+import json
+import mimetypes
+import os
+from flask import Blueprint, current_app, request, send_from_directory, url_for, abort
+
+# -----------------------------
+# Fingerprinted static assets
+# -----------------------------
+#
+# build_assets.py writes hashed copies of the files in ASSET_SOURCES (plus
+# .gz / .br variants) into static/dist/ together with a manifest mapping the
+# logical name to the hashed one. Templates call asset_url("css/style.css");
+# without a manifest (local dev) it falls back to plain Flask static serving.
+
+ASSET_SOURCES = ["css/style.css", "js/main.js"]
+DIST_DIR = "dist"
+MANIFEST_NAME = "manifest.json"
+
+# Hashed names never change content, so caches may keep them for a year
+IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+
+# Preferred first
+ENCODINGS = [("br", ".br"), ("gzip", ".gz")]
+
+assets_bp = Blueprint("assets", __name__)
+
+
+def init_assets(app):
+    app.config.setdefault("ASSET_DIST_DIR", os.path.join(app.static_folder, DIST_DIR))
+    app.extensions["asset_manifest"] = load_manifest(app.config["ASSET_DIST_DIR"])
+    app.register_blueprint(assets_bp)
+    app.add_template_global(asset_url)
+
+
+def load_manifest(dist_dir):
+    try:
+        with open(os.path.join(dist_dir, MANIFEST_NAME), encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
+
+
+def asset_url(name):
+    """URL for a static asset, fingerprinted when a build manifest exists."""
+    hashed = current_app.extensions.get("asset_manifest", {}).get(name)
+    if not hashed:
+        return url_for("static", filename=name)
+    return url_for("assets.serve_asset", filename=hashed)
+
+
+def accepted_encodings():
+    header = request.headers.get("Accept-Encoding") or ""
+    accepted = set()
+    for part in header.split(","):
+        token, _, params = part.strip().partition(";")
+        params = params.replace(" ", "")
+        if params.startswith("q="):
+            try:
+                if float(params[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        if token:
+            accepted.add(token.strip().lower())
+    return accepted
+
+
+@assets_bp.route("/assets/<path:filename>")
+def serve_asset(filename):
+    dist_dir = current_app.config["ASSET_DIST_DIR"]
+    # Any hashed file in dist/ is served, not just the current manifest's, so
+    # pages rendered against an earlier build still resolve after a rebuild
+    if os.path.basename(filename).startswith(MANIFEST_NAME):
+        abort(404)
+    # Precompressed variants are only served via Accept-Encoding negotiation
+    if filename.endswith(tuple(suffix for _, suffix in ENCODINGS)):
+        abort(404)
+
+    accepted = accepted_encodings()
+    served_name, encoding = filename, None
+    for enc, suffix in ENCODINGS:
+        if enc in accepted and os.path.isfile(os.path.join(dist_dir, filename + suffix)):
+            served_name, encoding = filename + suffix, enc
+            break
+
+    # Type comes from the uncompressed name, not the .br/.gz suffix
+    mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    resp = send_from_directory(dist_dir, served_name, mimetype=mimetype, max_age=IMMUTABLE_MAX_AGE)
+    if encoding:
+        resp.headers["Content-Encoding"] = encoding
+    resp.headers["Cache-Control"] = f"public, max-age={IMMUTABLE_MAX_AGE}, immutable"
+    resp.headers["Vary"] = "Accept-Encoding"
+    return resp
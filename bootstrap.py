@@ -0,0 +1,30 @@
+import os
+from dotenv import load_dotenv
+
+# -----------------------------
+# Shared configuration / client bootstrap
+# -----------------------------
+
+def load_config():
+    """Read settings from the environment (and .env) into a plain dict."""
+    load_dotenv()
+    return {
+        "SUPABASE_URL": os.environ.get("SUPABASE_URL"),
+        "SUPABASE_KEY": os.environ.get("SUPABASE_KEY"),
+        "SECRET_KEY": os.environ.get("SECRET_KEY", "change-this-secret-in-prod"),
+        "COMPLAINT_BUCKET": os.environ.get("COMPLAINT_BUCKET", "complaint-images"),
+        "WORK_BUCKET": os.environ.get("WORK_BUCKET", "work-images"),
+    }
+
+
+def check_config(config):
+    if not config.get("SUPABASE_URL") or not config.get("SUPABASE_KEY"):
+        raise EnvironmentError("SUPABASE_URL and SUPABASE_KEY must be set as environment variables")
+
+
+def create_supabase_client(config):
+    """Build a Supabase client from a config mapping (dict or app.config)."""
+    check_config(config)
+    # Imported here so processes that never talk to Supabase don't pay for it
+    from supabase import create_client
+    return create_client(config["SUPABASE_URL"], config["SUPABASE_KEY"])
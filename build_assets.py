@@ -0,0 +1,68 @@
+# build_assets.py
+# Fingerprint and precompress static assets: python build_assets.py
+import gzip
+import hashlib
+import json
+import os
+
+from assets import ASSET_SOURCES, DIST_DIR, MANIFEST_NAME
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip alone still works
+    brotli = None
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+
+
+def hashed_name(name, data):
+    digest = hashlib.sha256(data).hexdigest()[:12]
+    root, ext = os.path.splitext(name)
+    return f"{root}.{digest}{ext}"
+
+
+def write_once(path, make_bytes):
+    """Write path atomically unless it exists; hashed names mean identical content."""
+    if os.path.exists(path):
+        return
+    with open(path + ".tmp", "wb") as fh:
+        fh.write(make_bytes())
+    os.replace(path + ".tmp", path)
+
+
+def build(static_dir=STATIC_DIR):
+    # Earlier fingerprinted files are kept: running workers and browser caches
+    # may still reference them. Only the manifest is replaced.
+    dist_dir = os.path.join(static_dir, DIST_DIR)
+    os.makedirs(dist_dir, exist_ok=True)
+    manifest = {}
+
+    for name in ASSET_SOURCES:
+        with open(os.path.join(static_dir, name), "rb") as fh:
+            data = fh.read()
+        out_name = hashed_name(name, data)
+        out_path = os.path.join(dist_dir, out_name)
+        os.makedirs(os.path.dirname(out_path), exist_ok=True)
+
+        # Files being served are never rewritten, so no request sees a partial one
+        write_once(out_path, lambda: data)
+        # mtime=0 keeps the .gz output byte-identical across builds
+        write_once(out_path + ".gz", lambda: gzip.compress(data, compresslevel=9, mtime=0))
+        if brotli is not None:
+            write_once(out_path + ".br", lambda: brotli.compress(data, quality=11))
+
+        manifest[name] = out_name
+        print(f" - {name} -> {DIST_DIR}/{out_name}")
+
+    # Write then rename so a worker starting mid-build never reads a partial manifest
+    manifest_path = os.path.join(dist_dir, MANIFEST_NAME)
+    with open(manifest_path + ".tmp", "w", encoding="utf-8") as fh:
+        json.dump(manifest, fh, indent=2, sort_keys=True)
+    os.replace(manifest_path + ".tmp", manifest_path)
+    if brotli is None:
+        print("brotli not installed; wrote gzip variants only")
+    return manifest
+
+
+if __name__ == "__main__":
+    build()
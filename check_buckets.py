@@ -1,16 +1,11 @@
 # check_buckets.py
-from dotenv import load_dotenv
-load_dotenv()
-import os
-from supabase import create_client
+from bootstrap import load_config, create_supabase_client
 
-SUPABASE_URL = os.environ.get("SUPABASE_URL")
-SUPABASE_KEY = os.environ.get("SUPABASE_KEY")
-if not SUPABASE_URL or not SUPABASE_KEY:
+try:
+    supabase = create_supabase_client(load_config())
+except EnvironmentError:
     raise SystemExit("Set SUPABASE_URL and SUPABASE_KEY in .env")
 
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
-
 try:
     res = supabase.storage.list_buckets()
     # different supabase versions return different shapes:
@@ -116,3 +116,136 @@ DO $$ BEGIN
 EXCEPTION WHEN duplicate_object THEN NULL; END $$;
 
 
+
+-- -----------------------------
+-- Cold storage: archived complaints
+-- -----------------------------
+-- Closed complaints older than a cutoff are moved here (with their logs,
+-- assignments and feedback) by archive_closed_complaints(), keeping the hot
+-- tables and their indexes small. See archive_job.py.
+--
+-- NOTE: the archive tables copy the hot tables' columns once. When a column
+-- is added to complaints, complaint_status_logs, staff_assignments or
+-- feedbacks, add it to the matching *_archive table AND to the column lists
+-- in archive_closed_complaints() below.
+
+CREATE TABLE IF NOT EXISTS complaints_archive (
+  LIKE complaints INCLUDING DEFAULTS,
+  archived_at timestamptz DEFAULT now(),
+  PRIMARY KEY (id),
+  FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+  -- Lets PostgREST embed assignee:assigned_to(...) like on the hot table
+  FOREIGN KEY (assigned_to) REFERENCES users(id) ON DELETE SET NULL
+);
+
+CREATE TABLE IF NOT EXISTS complaint_status_logs_archive (
+  LIKE complaint_status_logs INCLUDING DEFAULTS,
+  PRIMARY KEY (id),
+  FOREIGN KEY (complaint_id) REFERENCES complaints_archive(id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS staff_assignments_archive (
+  LIKE staff_assignments INCLUDING DEFAULTS,
+  PRIMARY KEY (id),
+  FOREIGN KEY (complaint_id) REFERENCES complaints_archive(id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS feedbacks_archive (
+  LIKE feedbacks INCLUDING DEFAULTS,
+  PRIMARY KEY (id),
+  FOREIGN KEY (complaint_id) REFERENCES complaints_archive(id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_complaints_archive_user ON complaints_archive(user_id);
+CREATE INDEX IF NOT EXISTS idx_complaints_archive_created_at ON complaints_archive(created_at);
+CREATE INDEX IF NOT EXISTS idx_status_logs_archive_complaint ON complaint_status_logs_archive(complaint_id);
+
+-- Lets the archival / retention scans find candidates without touching the rest
+CREATE INDEX IF NOT EXISTS idx_complaints_closed_updated_at ON complaints(updated_at) WHERE status = 'Closed';
+CREATE INDEX IF NOT EXISTS idx_notifications_read_created_at ON notifications(created_at) WHERE read;
+
+-- Move one batch of old Closed complaints into the archive tables.
+-- Returns the number of complaints moved; call repeatedly until it is 0.
+CREATE OR REPLACE FUNCTION archive_closed_complaints(older_than_days int, batch_size int)
+RETURNS int AS $$
+DECLARE
+  ids uuid[];
+BEGIN
+  IF older_than_days IS NULL OR batch_size IS NULL OR older_than_days < 1 OR batch_size < 1 THEN
+    RAISE EXCEPTION 'older_than_days and batch_size must be >= 1 (got %, %)', older_than_days, batch_size;
+  END IF;
+
+  SELECT array_agg(id) INTO ids FROM (
+    SELECT id FROM complaints
+    WHERE status = 'Closed' AND updated_at < now() - make_interval(days => older_than_days)
+    ORDER BY updated_at
+    LIMIT batch_size
+    FOR UPDATE SKIP LOCKED
+  ) batch;
+
+  IF ids IS NULL THEN
+    RETURN 0;
+  END IF;
+
+  -- No ON CONFLICT: an id already in the archive aborts the whole batch
+  -- rather than deleting hot rows that were never copied.
+  INSERT INTO complaints_archive
+    (id, user_id, title, description, city, pincode, landmark, status, assigned_to,
+     complaint_images, work_images, created_at, updated_at, created_by, archived_at)
+  -- complaints.assigned_to has no FK, so an assignee may since have been
+  -- deleted; archive those as unassigned instead of failing the batch.
+  SELECT c.id, c.user_id, c.title, c.description, c.city, c.pincode, c.landmark, c.status, u.id,
+         c.complaint_images, c.work_images, c.created_at, c.updated_at, c.created_by, now()
+  FROM complaints c LEFT JOIN users u ON u.id = c.assigned_to
+  WHERE c.id = ANY(ids);
+
+  INSERT INTO complaint_status_logs_archive
+    (id, complaint_id, status, notes, created_at, created_by)
+  SELECT id, complaint_id, status, notes, created_at, created_by
+  FROM complaint_status_logs WHERE complaint_id = ANY(ids);
+
+  INSERT INTO staff_assignments_archive
+    (id, complaint_id, staff_id, assigned_at, assigned_by)
+  SELECT id, complaint_id, staff_id, assigned_at, assigned_by
+  FROM staff_assignments WHERE complaint_id = ANY(ids);
+
+  INSERT INTO feedbacks_archive
+    (id, complaint_id, rating, comments, created_at, created_by)
+  SELECT id, complaint_id, rating, comments, created_at, created_by
+  FROM feedbacks WHERE complaint_id = ANY(ids);
+
+  -- Child rows go with the complaint via ON DELETE CASCADE
+  DELETE FROM complaints WHERE id = ANY(ids);
+
+  RETURN cardinality(ids);
+END;
+$$ LANGUAGE plpgsql;
+
+-- Delete one batch of read notifications older than the retention window.
+-- Returns the number of rows deleted; call repeatedly until it is 0.
+CREATE OR REPLACE FUNCTION purge_read_notifications(older_than_days int, batch_size int)
+RETURNS int AS $$
+DECLARE
+  removed int;
+BEGIN
+  IF older_than_days IS NULL OR batch_size IS NULL OR older_than_days < 1 OR batch_size < 1 THEN
+    RAISE EXCEPTION 'older_than_days and batch_size must be >= 1 (got %, %)', older_than_days, batch_size;
+  END IF;
+
+  DELETE FROM notifications
+  WHERE id IN (
+    SELECT id FROM notifications
+    WHERE read AND created_at < now() - make_interval(days => older_than_days)
+    ORDER BY created_at
+    LIMIT batch_size
+    FOR UPDATE SKIP LOCKED
+  );
+  GET DIAGNOSTICS removed = ROW_COUNT;
+  RETURN removed;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Only the service role (archive_job.py) may run these; keep them off the
+-- public PostgREST /rpc/ endpoints.
+REVOKE EXECUTE ON FUNCTION archive_closed_complaints(int, int) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION purge_read_notifications(int, int) FROM PUBLIC, anon, authenticated;
@@ -29,6 +29,10 @@ document.addEventListener("DOMContentLoaded", () => {
   if (path.includes("/user") || path.includes("/admin")) {
     loadComplaints();
     loadStaffIntoAdminDropdown(); 
+    const archivedToggle = document.getElementById("include-archived");
+    if (archivedToggle) archivedToggle.addEventListener("change", toggleArchivedComplaints);
+    const archivedMore = document.getElementById("archived-load-more");
+    if (archivedMore) archivedMore.addEventListener("click", loadArchivedComplaints);
 
   }
   if (path.includes("/verifier")) {
@@ -213,84 +217,120 @@ async function loadComplaints() {
     if (!data.success) return console.error("Could not fetch complaints", data);
     const container = document.getElementById("complaints-container");
     container.innerHTML = "";
-    (data.data || []).forEach(c => {
-      const div = document.createElement("div");
-      const assigneeInfo = c.assignee ? `
-        <p class="small mb-0 mt-2">
-            <strong>Assigned To:</strong> [${c.assignee.short_id}] ${c.assignee.first_name || ''} ${c.assignee.last_name || ''}
-        </p>` : "";
-      div.className = "complaint-card p-3 mb-2 border rounded";
-      let userInfo = '';
-      if (window.location.pathname.includes("/admin") && c.creator) {
-          userInfo = `
-              <div class="small text-muted p-2 bg-light rounded mt-2">
-                  <strong>Submitted by:</strong> ${c.creator.first_name} ${c.creator.last_name}<br>
-                  <strong>Contact:</strong> ${c.creator.email}
-              </div>`;
-      }
-      
-      const statusClass = mapStatusClass(c.status);
-      const statusPill = `<span class="status-pill ${statusClass}"><i class="bi bi-circle"></i> ${escapeHtml(c.status || "Open")}</span>`;
-
-      // Complaint images
-      const complaintImgsHTML = (c.complaint_images || []).map(u => `<img src="${u}" class="complaint-thumb" />`).join("");
-
-      // Work images (uploaded by admin/staff)
-      const workImgsHTML = (c.work_images && c.work_images.length > 0) ? `
-        <div class="work-images-section mt-3">
-          <h5>Work Progress Images</h5>
-          <div class="d-flex flex-wrap gap-2">
-            ${c.work_images.map(url => `<img src="${url}" class="work-thumb" />`).join('')}
-          </div>
-        </div>
-      ` : "";
+    (data.data || []).forEach(c => container.appendChild(renderComplaintCard(c)));
+  } catch (err) {
+    console.error("Error loading complaints:", err);
+  }
+}
 
-      div.innerHTML = `
-        <div class="d-flex justify-content-between align-items-start">
-            <h3 class="mb-1">${escapeHtml(c.title || "Untitled")}</h3>
-            ${statusPill}
-        </div>
-        <p class="mb-2">${escapeHtml(c.description || "")}</p>
-        <p class="small"><strong>Location:</strong> ${escapeHtml(c.city||"")}, ${escapeHtml(c.pincode||"")}</p>
-        <div>${complaintImgsHTML}</div>
-        ${workImgsHTML}
-        ${assigneeInfo}
-        ${userInfo}  `;
-
-      // if admin page, add update button
-      if (window.location.pathname.includes("/admin")) {
-        const btnRow = document.createElement("div");
-        btnRow.className = "d-flex gap-2 mt-2";
-        const btn = document.createElement("button");
-        btn.textContent = "Edit / Assign";
-        btn.className = "btn btn-sm btn-sky";
-        btn.onclick = () => {
-          const updateForm = document.getElementById("update-form");
-          if (!updateForm) return alert("Update form not present");
-          updateForm.querySelector("[name='complaint_id']").value = c.id;
-          window.scrollTo(0, updateForm.offsetTop - 20);
-        };
-        const btn2 = document.createElement("a");
-        btn2.href = "#complaints-container";
-        btn2.className = "btn btn-sm btn-outline-secondary";
-        btn2.textContent = "Details";
-        btnRow.appendChild(btn);
-        btnRow.appendChild(btn2);
-        div.appendChild(btnRow);
-      }
-
-      if ((c.status === 'Resolved' || c.status === 'Closed') && !window.location.pathname.includes("/admin")) {
-        const feedbackBtn = document.createElement("button");
-        feedbackBtn.textContent = "Provide Feedback";
-        feedbackBtn.className = "btn btn-sm btn-success mt-2";
-        feedbackBtn.onclick = () => showFeedbackModal(c.id);
-        div.appendChild(feedbackBtn);
-    }
+function renderComplaintCard(c) {
+  const div = document.createElement("div");
+  const assigneeInfo = c.assignee ? `
+    <p class="small mb-0 mt-2">
+        <strong>Assigned To:</strong> [${c.assignee.short_id}] ${c.assignee.first_name || ''} ${c.assignee.last_name || ''}
+    </p>` : "";
+  div.className = "complaint-card p-3 mb-2 border rounded";
+  let userInfo = '';
+  if (window.location.pathname.includes("/admin") && c.creator) {
+      userInfo = `
+          <div class="small text-muted p-2 bg-light rounded mt-2">
+              <strong>Submitted by:</strong> ${c.creator.first_name} ${c.creator.last_name}<br>
+              <strong>Contact:</strong> ${c.creator.email}
+          </div>`;
+  }
+  
+  const statusClass = mapStatusClass(c.status);
+  const statusPill = `<span class="status-pill ${statusClass}"><i class="bi bi-circle"></i> ${escapeHtml(c.status || "Open")}</span>`
+    + (c.archived ? ` <span class="badge bg-secondary">Archived</span>` : "");
+
+  // Complaint images
+  const complaintImgsHTML = (c.complaint_images || []).map(u => `<img src="${u}" class="complaint-thumb" />`).join("");
+
+  // Work images (uploaded by admin/staff)
+  const workImgsHTML = (c.work_images && c.work_images.length > 0) ? `
+    <div class="work-images-section mt-3">
+      <h5>Work Progress Images</h5>
+      <div class="d-flex flex-wrap gap-2">
+        ${c.work_images.map(url => `<img src="${url}" class="work-thumb" />`).join('')}
+      </div>
+    </div>
+  ` : "";
+
+  div.innerHTML = `
+    <div class="d-flex justify-content-between align-items-start">
+        <h3 class="mb-1">${escapeHtml(c.title || "Untitled")}</h3>
+        ${statusPill}
+    </div>
+    <p class="mb-2">${escapeHtml(c.description || "")}</p>
+    <p class="small"><strong>Location:</strong> ${escapeHtml(c.city||"")}, ${escapeHtml(c.pincode||"")}</p>
+    <div>${complaintImgsHTML}</div>
+    ${workImgsHTML}
+    ${assigneeInfo}
+    ${userInfo}  `;
+
+  // if admin page, add update button
+  // Archived complaints are read-only
+  if (window.location.pathname.includes("/admin") && !c.archived) {
+    const btnRow = document.createElement("div");
+    btnRow.className = "d-flex gap-2 mt-2";
+    const btn = document.createElement("button");
+    btn.textContent = "Edit / Assign";
+    btn.className = "btn btn-sm btn-sky";
+    btn.onclick = () => {
+      const updateForm = document.getElementById("update-form");
+      if (!updateForm) return alert("Update form not present");
+      updateForm.querySelector("[name='complaint_id']").value = c.id;
+      window.scrollTo(0, updateForm.offsetTop - 20);
+    };
+    const btn2 = document.createElement("a");
+    btn2.href = "#complaints-container";
+    btn2.className = "btn btn-sm btn-outline-secondary";
+    btn2.textContent = "Details";
+    btnRow.appendChild(btn);
+    btnRow.appendChild(btn2);
+    div.appendChild(btnRow);
+  }
 
-      container.appendChild(div);
-    });
+  if ((c.status === 'Resolved' || c.status === 'Closed') && !c.archived && !window.location.pathname.includes("/admin")) {
+    const feedbackBtn = document.createElement("button");
+    feedbackBtn.textContent = "Provide Feedback";
+    feedbackBtn.className = "btn btn-sm btn-success mt-2";
+    feedbackBtn.onclick = () => showFeedbackModal(c.id);
+    div.appendChild(feedbackBtn);
+  }
+
+  return div;
+}
+
+/* -------------------------
+   Archived complaints (read-only, paged)
+   ------------------------- */
+let archivedNextOffset = 0;
+
+function toggleArchivedComplaints(e) {
+  const section = document.getElementById("archived-section");
+  if (!section) return;
+  document.getElementById("archived-container").innerHTML = "";
+  section.classList.toggle("d-none", !e.target.checked);
+  if (e.target.checked) {
+    archivedNextOffset = 0;
+    loadArchivedComplaints();
+  }
+}
+
+async function loadArchivedComplaints() {
+  const moreBtn = document.getElementById("archived-load-more");
+  try {
+    const resp = await fetch(`/archived_complaints?offset=${archivedNextOffset}`);
+    const data = await resp.json();
+    if (!data.success) return console.error("Could not fetch archived complaints", data);
+    const container = document.getElementById("archived-container");
+    (data.data || []).forEach(c => container.appendChild(renderComplaintCard(c)));
+    if (!container.children.length) container.innerHTML = `<p class="small text-muted mb-0">No archived complaints.</p>`;
+    archivedNextOffset = data.next_offset;
+    moreBtn.classList.toggle("d-none", data.next_offset == null);
   } catch (err) {
-    console.error("Error loading complaints:", err);
+    console.error("Error loading archived complaints:", err);
   }
 }
 
@@ -1,15 +1,12 @@
 # test_upload.py
-from dotenv import load_dotenv
-load_dotenv()
 import os
-from supabase import create_client
 from uuid import uuid4
+from bootstrap import load_config, create_supabase_client
 
-SUPABASE_URL = os.environ.get("SUPABASE_URL")
-SUPABASE_KEY = os.environ.get("SUPABASE_KEY")
+config = load_config()
 BUCKET = os.environ.get("COMPLAINT_BUCKET") or "complaint-image"
 
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+supabase = create_supabase_client(config)
 
 data = b"hello supabase storage test"
 dest = f"test_uploads/{uuid4().hex}_test.txt"